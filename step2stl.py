@@ -15,20 +15,96 @@ Two modes:
 
 Notes:
 - Requires FreeCAD Python modules (FreeCAD, Part, Mesh, MeshPart) available (e.g., via FreeCADCmd).
-- STL is ASCII for broad compatibility.
+- STL is binary by default (smaller, faster to write); pass --ascii-stl for ASCII.
 """
 
 from __future__ import annotations
 
 import argparse
+import atexit
+import hashlib
+import multiprocessing
+import os
+import pickle
 import sys
 from pathlib import Path
-from typing import Iterable, Tuple
-import shutil
+from types import SimpleNamespace
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple
+import struct
+import tempfile
+import threading
 import time
 import math
+import itertools
 import json
 
+STEP_EXTS = (".step", ".stp")
+
+# Process umask, so STLs written via a temp file get the usual permissions
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Document reused (and purged) for every import in a process (one per thread with --jobs)
+SCRATCH_DOC_NAME = "step2stl_scratch"
+
+# FreeCAD's document layer is not thread-safe: with --jobs, imports and object
+# access are serialized while meshing itself runs concurrently
+_DOC_LOCK = threading.Lock()
+
+# FreeCAD modules, imported once per process by `_load_freecad()`
+_FC: Optional[SimpleNamespace] = None
+
+# Preferences overridden while converting headless. The STEP importer reads its
+# options from Mod/Import; progress reporting and link groups only serve the GUI.
+_HEADLESS_PARAMS = (
+    ("User parameter:BaseApp/Preferences/Mod/Import", "ShowProgress", False),
+    ("User parameter:BaseApp/Preferences/Mod/Import", "UseLinkGroup", False),
+    ("User parameter:BaseApp/Preferences/Document", "CreateBackupFiles", False),
+)
+
+
+def _configure_headless(App) -> None:
+    """Apply `_HEADLESS_PARAMS`, restoring the user's own values at exit.
+
+    FreeCAD persists parameters to user.cfg, so the overrides must not leak.
+    """
+    saved = []
+    for group, key, value in _HEADLESS_PARAMS:
+        grp = App.ParamGet(group)
+        saved.append((grp, key, key in grp.GetBools(), grp.GetBool(key, value)))
+        grp.SetBool(key, value)
+
+    def restore() -> None:
+        for grp, key, existed, old in saved:
+            if existed:
+                grp.SetBool(key, old)
+            else:
+                grp.RemBool(key)
+
+    atexit.register(restore)
+
+
+def _load_freecad() -> SimpleNamespace:
+    """Import FreeCAD, Part, Mesh, MeshPart and Import once and return them.
+
+    Raises ImportError if FreeCAD's Python modules are not available.
+    """
+    global _FC
+    if _FC is None:
+        import FreeCAD  # type: ignore
+        import Part  # type: ignore
+        import Mesh  # type: ignore
+        import MeshPart  # type: ignore
+        import Import  # type: ignore
+
+        # FreeCADGui is never imported, so no view providers are created on import
+        try:
+            _configure_headless(FreeCAD)
+        except Exception:
+            pass
+        _FC = SimpleNamespace(App=FreeCAD, Part=Part, Mesh=Mesh, MeshPart=MeshPart, Import=Import)
+    return _FC
+
 
 def parse_args(argv: Iterable[str]) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Convert STEP to STL using FreeCAD")
@@ -49,8 +125,8 @@ def parse_args(argv: Iterable[str]) -> argparse.Namespace:
         "-q",
         "--quality",
         choices=["high", "medium", "low", "custom"],
-        default="high",
-        help="Mesh quality preset (default: high)",
+        default="medium",
+        help="Mesh quality preset (default: medium)",
     )
     # Orientation helpers
     p.add_argument("--source-up", choices=["x", "y", "z"], default=None, help="Source 'up' axis")
@@ -58,6 +134,12 @@ def parse_args(argv: Iterable[str]) -> argparse.Namespace:
     p.add_argument("--rotate-x", type=float, default=0.0, help="Rotate degrees about X after up-mapping")
     p.add_argument("--rotate-y", type=float, default=0.0, help="Rotate degrees about Y after up-mapping")
     p.add_argument("--rotate-z", type=float, default=0.0, help="Rotate degrees about Z after up-mapping")
+    p.add_argument(
+        "--rotate-mesh",
+        action="store_true",
+        default=False,
+        help="Apply the orientation to the tessellated mesh instead of the BRep shape",
+    )
     p.add_argument(
         "--linear-deflection",
         type=float,
@@ -78,19 +160,54 @@ def parse_args(argv: Iterable[str]) -> argparse.Namespace:
     )
     p.add_argument(
         "--binary",
+        dest="binary",
+        action="store_true",
+        default=True,
+        help="Output binary STL (default; smaller files, faster write)",
+    )
+    p.add_argument(
+        "--ascii-stl",
+        dest="binary",
+        action="store_false",
+        help="Output ASCII STL instead of binary",
+    )
+    p.add_argument(
+        "--force",
         action="store_true",
         default=False,
-        help="Output binary STL instead of ASCII (smaller files, faster write)",
+        help="Reconvert even if the STL is up to date (newer than its STEP, or unchanged per its .stl.meta)",
+    )
+    p.add_argument(
+        "--defer-move",
+        action="store_true",
+        default=False,
+        help="Drop-folder mode: move converted STEP files into _processed/ after the whole batch instead of one by one",
+    )
+    p.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=0,
+        help="Number of worker processes (default: one per CPU core, capped by file count; 1 disables the pool)",
+    )
+    p.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Convert N files concurrently in threads of this process instead of worker processes (default: 1)",
     )
     return p.parse_args(list(argv))
 
 
 def resolve_mesh_params(ns: argparse.Namespace) -> Tuple[float, float, bool]:
-    # Sensible defaults inspired by FreeCAD best practices
+    # Sensible defaults inspired by FreeCAD best practices. Linear deflection is
+    # absolute (model units, usually mm) so small features of large assemblies
+    # don't explode the triangle count the way a relative deflection does.
     presets = {
-        "high": dict(linear=0.05, angular=10.0, relative=True),
-        "medium": dict(linear=0.10, angular=15.0, relative=True),
-        "low": dict(linear=0.25, angular=25.0, relative=True),
+        "high": dict(linear=0.1, angular=10.0, relative=False),
+        "medium": dict(linear=0.5, angular=20.0, relative=False),
+        "low": dict(linear=2.0, angular=30.0, relative=False),
     }
 
     if ns.quality == "custom":
@@ -107,29 +224,42 @@ def resolve_mesh_params(ns: argparse.Namespace) -> Tuple[float, float, bool]:
     return float(linear), float(angular), bool(relative)
 
 
-def find_step_files(root: Path) -> Iterable[Path]:
-    exts = {".step", ".stp"}
-    if root.is_file() and root.suffix.lower() in exts:
-        yield root
+def _walk_step_files(top: str, warn: bool) -> Iterator[Path]:
+    # Unreadable directories are skipped (as rglob did) rather than aborting the run
+    try:
+        it = os.scandir(top)
+    except OSError as e:
+        if warn:
+            print(f"WARN: skipping unreadable directory {top}: {e}")
         return
-    if root.is_dir():
-        for p in root.rglob("*"):
-            if not p.is_file():
-                continue
-            if p.suffix.lower() not in exts:
-                continue
-            # Ignore files inside any _processed/ path under the given root
+    # DirEntry.is_dir()/is_file() come from the readdir data, so no extra stat
+    with it:
+        for entry in it:
             try:
-                rel = p.parent.relative_to(root)
-                if any(part == "_processed" for part in rel.parts):
+                is_dir = entry.is_dir(follow_symlinks=False)
+                is_step = not is_dir and entry.is_file() and entry.name.lower().endswith(STEP_EXTS)
+            except OSError:
+                continue
+            if is_dir:
+                # Prune _processed/ at directory level instead of checking every file
+                if entry.name == "_processed":
                     continue
-            except Exception:
-                pass
-            yield p
+                yield from _walk_step_files(entry.path, warn)
+            elif is_step:
+                yield Path(entry.path)
+
+
+def find_step_files(root: Path, warn: bool = True) -> Iterable[Path]:
+    if root.is_file() and root.suffix.lower() in STEP_EXTS:
+        yield root
+        return
+    if root.is_dir():
+        # Files inside any _processed/ directory under the given root are ignored
+        yield from _walk_step_files(os.fspath(root), warn)
 
 
 def _axis_vec(axis: str):
-    import FreeCAD as App  # type: ignore
+    App = _load_freecad().App
 
     axis = axis.lower()
     if axis == "x":
@@ -144,25 +274,15 @@ def compose_rotation(ns) -> "object":
 
     Returns a FreeCAD.Rotation (identity if no rotation requested).
     """
-    import FreeCAD as App  # type: ignore
+    App = _load_freecad().App
 
     rot = App.Rotation()  # identity
     # Map source up to target up if provided
     s_up = getattr(ns, "source_up", None)
     t_up = getattr(ns, "target_up", None) or (s_up and "z")
     if s_up and t_up and s_up != t_up:
-        v1 = _axis_vec(s_up)
-        v2 = _axis_vec(t_up)
-        # Compute axis-angle
-        dot = float(v1.dot(v2)) / (v1.Length * v2.Length)
-        dot = max(-1.0, min(1.0, dot))
-        angle_rad = math.acos(dot)
-        angle_deg = math.degrees(angle_rad)
-        axis = v1.cross(v2)
-        if axis.Length < 1e-9:
-            # Opposite vectors; choose a perpendicular axis
-            axis = App.Vector(1, 0, 0) if abs(v1.x) < 0.9 else App.Vector(0, 1, 0)
-        rot = App.Rotation(axis, angle_deg).multiply(rot)
+        # Rotation(v1, v2) maps v1 onto v2 (antiparallel vectors included)
+        rot = App.Rotation(_axis_vec(s_up), _axis_vec(t_up)).multiply(rot)
 
     # Then apply explicit Euler-like rotations X -> Y -> Z
     rx = getattr(ns, "rotate_x", 0.0) or 0.0
@@ -177,93 +297,528 @@ def compose_rotation(ns) -> "object":
     return rot
 
 
+def _rotation_params(rot) -> Tuple[Tuple[float, float, float], float]:
+    """Reduce a FreeCAD.Rotation to a picklable ((x, y, z), degrees) axis/angle pair."""
+    axis = rot.Axis
+    return (float(axis.x), float(axis.y), float(axis.z)), math.degrees(rot.Angle)
+
+
+def _rotation_from_params(rot_params: Optional[Tuple[Tuple[float, float, float], float]]) -> "object":
+    """Rebuild the FreeCAD.Rotation described by `_rotation_params` (worker side).
+
+    Returns None for None, i.e. no rotation.
+    """
+    if rot_params is None:
+        return None
+    App = _load_freecad().App
+
+    axis, angle_deg = rot_params
+    return App.Rotation(App.Vector(*axis), float(angle_deg))
+
+
+class MeshParams(NamedTuple):
+    """Tessellation/output settings for one file."""
+
+    linear: float
+    angular: float
+    relative: bool
+    rot: object = None  # FreeCAD.Rotation applied before meshing, if any
+    binary: bool = True
+    rotate_mesh: bool = False  # apply `rot` to the mesh instead of the shape
+
+
+def _apply_rotation(App, shape, rot):
+    """Apply `rot` on top of `shape`'s own placement, in place, and return it.
+
+    `rot` is None when no rotation was requested (see `main`).
+    """
+    if rot is not None:
+        # A Placement is a rigid transform on the shape; no topology copy needed
+        shape.Placement = App.Placement(App.Vector(0, 0, 0), rot).multiply(shape.Placement)
+    return shape
+
+
+def _apply_rotation_to_mesh(mesh, rot):
+    """Apply `rot` to every vertex of `mesh`, in place, and return it.
+
+    Mesh.transform runs in C++ over the whole point array. Round-tripping the
+    vertices through NumPy would not help: rebuilding a Mesh from Python needs
+    one FreeCAD Vector per vertex, which is the per-element loop to avoid.
+    """
+    mesh.transform(rot.toMatrix())
+    return mesh
+
+
+def _mesh_shape(fc: SimpleNamespace, shape, params: MeshParams):
+    # MeshPart is the only shape tessellation entry point; Mesh.Mesh() has no
+    # Shape/deflection constructor (its init ignores keyword arguments)
+    return fc.MeshPart.meshFromShape(
+        Shape=shape,
+        LinearDeflection=float(params.linear),
+        AngularDeflection=float(params.angular),
+        Relative=bool(params.relative),
+    )
+
+
+def _stl_records(mesh):
+    """Build the binary STL records for `mesh` as one NumPy structured array.
+
+    Normals are recomputed from the vertex winding in bulk. Raises ImportError
+    if NumPy is not available.
+    """
+    import numpy as np  # type: ignore  # ships with FreeCAD
+
+    dtype = np.dtype(
+        [("n", "<f4", (3,)), ("v0", "<f4", (3,)), ("v1", "<f4", (3,)), ("v2", "<f4", (3,)), ("attr", "<u2")]
+    )
+    points, facets = mesh.Topology
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    tri = pts[np.asarray(facets, dtype=np.int64).reshape(-1, 3)]
+    n = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    length = np.linalg.norm(n, axis=1, keepdims=True)
+    np.divide(n, length, out=n, where=length > 0)  # leave degenerate facets at 0
+    records = np.zeros(len(tri), dtype=dtype)
+    records["n"] = n
+    records["v0"] = tri[:, 0]
+    records["v1"] = tri[:, 1]
+    records["v2"] = tri[:, 2]
+    return records
+
+
+class _StlStreamWriter:
+    """Append meshes to an STL file one at a time instead of merging them first.
+
+    Output goes to a uniquely named temp file next to `out_path`, which is
+    renamed over `out_path` on close; if the `with` block raises, only the
+    temp file is removed and any previous STL is left intact. Binary output
+    starts with a placeholder triangle count that is patched on close.
+    """
+
+    _RECORD = struct.Struct("<12fH")  # normal, 3 vertices, attribute byte count
+    _ASCII_FACET = (
+        "  facet normal %e %e %e\n    outer loop\n"
+        "      vertex %e %e %e\n      vertex %e %e %e\n      vertex %e %e %e\n"
+        "    endloop\n  endfacet\n"
+    )
+    _ASCII_CHUNK = 1 << 16  # facets formatted per write
+
+    def __init__(self, out_path: Path, binary: bool = True):
+        self.out_path = out_path
+        self.binary = binary
+        self.count = 0
+        fd, tmp = tempfile.mkstemp(dir=out_path.parent, prefix=out_path.name + ".", suffix=".tmp")
+        self.tmp_path = Path(tmp)
+        os.chmod(tmp, 0o666 & ~_UMASK)  # mkstemp creates files as 0600
+        if binary:
+            self._f = os.fdopen(fd, "wb")
+            self._f.write(b"step2stl".ljust(80, b"\0"))
+            self._f.write(struct.pack("<I", 0))
+        else:
+            self._f = os.fdopen(fd, "w", encoding="ascii")
+            self._f.write("solid step2stl\n")
+
+    def add(self, mesh) -> None:
+        try:
+            records = _stl_records(mesh)
+        except ImportError:
+            records = None
+        if records is not None:
+            if self.binary:
+                self._f.write(records.tobytes())
+            else:
+                self._write_ascii(records)
+            self.count += len(records)
+            return
+        # Fallback without NumPy: go facet by facet
+        facets = mesh.Facets
+        if self.binary:
+            rec = self._RECORD
+            buf = bytearray(rec.size * len(facets))
+            for i, f in enumerate(facets):
+                n = f.Normal
+                a, b, c = f.Points
+                rec.pack_into(buf, i * rec.size, n.x, n.y, n.z, *a, *b, *c, 0)
+            self._f.write(buf)
+        else:
+            write = self._f.write
+            for f in facets:
+                n = f.Normal
+                write(f"  facet normal {n.x:e} {n.y:e} {n.z:e}\n    outer loop\n")
+                for p in f.Points:
+                    write(f"      vertex {p[0]:e} {p[1]:e} {p[2]:e}\n")
+                write("    endloop\n  endfacet\n")
+        self.count += len(facets)
+
+    def _write_ascii(self, records) -> None:
+        import numpy as np  # type: ignore
+
+        # One row of 12 floats per facet; %-formatting a whole chunk runs in C
+        rows = np.concatenate([records["n"], records["v0"], records["v1"], records["v2"]], axis=1)
+        for start in range(0, len(rows), self._ASCII_CHUNK):
+            chunk = rows[start:start + self._ASCII_CHUNK]
+            self._f.write((self._ASCII_FACET * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+    def close(self) -> None:
+        if self.binary:
+            self._f.seek(80)
+            self._f.write(struct.pack("<I", self.count))
+        else:
+            self._f.write("endsolid step2stl\n")
+        self._f.close()
+        os.replace(self.tmp_path, self.out_path)
+
+    def __enter__(self) -> "_StlStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            try:
+                self.close()
+            except BaseException:
+                self._discard()
+                raise
+            return
+        self._discard()
+
+    def _discard(self) -> None:
+        self._f.close()
+        try:
+            self.tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def _scratch_document(fc: SimpleNamespace):
+    """Return this thread's reusable import document, creating it on first use."""
+    name = SCRATCH_DOC_NAME
+    if threading.current_thread() is not threading.main_thread():
+        name = f"{SCRATCH_DOC_NAME}_{threading.get_ident()}"
+    with _DOC_LOCK:
+        doc = fc.App.listDocuments().get(name)
+        if doc is None:
+            doc = fc.App.newDocument(name)
+            try:
+                # No undo/transaction bookkeeping while importing and removing objects
+                doc.UndoMode = 0
+            except Exception:
+                pass
+    return doc
+
+
+def _close_scratch_documents(fc: SimpleNamespace) -> None:
+    for name in list(fc.App.listDocuments()):
+        if name.startswith(SCRATCH_DOC_NAME):
+            try:
+                fc.App.closeDocument(name)
+            except Exception:
+                pass
+
+
+def _purge_document(doc) -> None:
+    for name in [o.Name for o in doc.Objects]:
+        try:
+            doc.removeObject(name)
+        except Exception:
+            pass
+
+
+def _global_shapes(fc: SimpleNamespace, doc) -> list:
+    """Return the document's geometry as shapes in global coordinates.
+
+    Each root object is resolved with Part.getShape, which applies the
+    placements of containing App::Part/LinkGroup objects and expands
+    App::Link instances. A root compound is split into its children so that
+    it can be meshed and streamed piece by piece.
+    """
+    shapes = []
+    for root in doc.RootObjects:
+        try:
+            sh = fc.Part.getShape(root, "", needSubElement=False, transform=True)
+        except Exception:
+            continue
+        if sh is None or sh.isNull():
+            continue
+        shapes.extend(sh.childShapes() if sh.ShapeType == "Compound" else [sh])
+    return shapes
+
+
+def _convert_via_document(
+    fc: SimpleNamespace, doc, src: Path, out_path: Path, params: MeshParams
+) -> Tuple[bool, str]:
+    """Import the STEP once into `doc` and mesh its shapes one by one.
+
+    Each piece's mesh is streamed straight to the STL file and dropped before
+    the next one is meshed. The imported document itself stays loaded until
+    the file is done (links may share parts across the tree); `doc` is reused
+    across files and is left empty on return.
+    """
+    shapes = []
+    try:
+        with _DOC_LOCK:
+            _purge_document(doc)
+            fc.Import.insert(os.fspath(src), doc.Name)
+            shapes = _global_shapes(fc, doc)
+        if not shapes:
+            raise RuntimeError("no meshable shapes found")
+        with _StlStreamWriter(out_path, params.binary) as stl:
+            for sh in shapes:
+                if params.rotate_mesh and params.rot is not None:
+                    m = _apply_rotation_to_mesh(_mesh_shape(fc, sh, params), params.rot)
+                else:
+                    m = _mesh_shape(fc, _apply_rotation(fc.App, sh, params.rot), params)
+                stl.add(m)
+                del m
+        return True, f"OK: {src.name} -> {out_path} ({len(shapes)} parts)"
+    finally:
+        shapes.clear()
+        with _DOC_LOCK:
+            _purge_document(doc)
+
+
+def _looks_like_step(src: Path) -> bool:
+    """Sniff the header so empty or non-STEP files fail before OCCT parses them.
+
+    Every ISO 10303-21 file starts with an "ISO-10303-21;" line.
+    """
+    if src.stat().st_size < 200:
+        return False
+    with open(src, "rb") as f:
+        head = f.read(4096)
+    return b"ISO-10303" in head
+
+
 def convert_file(
+    fc: SimpleNamespace,
+    doc,
     src: Path,
     dst_dir: Path,
     linear_deflection: float,
     angular_deflection: float,
     relative: bool,
-    binary: bool = False,
+    binary: bool = True,
+    rot=None,
+    rotate_mesh: bool = False,
 ) -> Tuple[bool, str]:
+    # `dst_dir` must already exist; main() creates all output dirs up front
     try:
-        # Lazy imports so the script can show a clean error if FreeCAD is missing
-        import FreeCAD  # type: ignore
-        import Part  # type: ignore
-        import Mesh  # type: ignore
-        import MeshPart  # type: ignore
-
-        dst_dir.mkdir(parents=True, exist_ok=True)
         out_path = dst_dir / (src.stem + ".stl")
+        params = MeshParams(linear_deflection, angular_deflection, relative, rot, binary, rotate_mesh)
+        return _convert_via_document(fc, doc, src, out_path, params)
+    except Exception as e:  # noqa: BLE001
+        return False, f"ERROR: {src} -> {e}"
+
+
+def _is_up_to_date(src: Path, out_path: Path) -> bool:
+    try:
+        return out_path.stat().st_mtime >= src.stat().st_mtime
+    except OSError:
+        return False
+
+
+def _sha1_file(path: Path) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
 
-        # First attempt: direct read as a single (possibly compound) shape
+
+def _read_meta(meta_path: Path) -> Optional[dict]:
+    try:
+        return json.loads(meta_path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _convert_one(
+    src: Path,
+    out_dir: Path,
+    linear: float,
+    angular: float,
+    relative: bool,
+    rot_params: Optional[Tuple[Tuple[float, float, float], float]],
+    binary: bool = True,
+    rotate_mesh: bool = False,
+    skip_if_newer: bool = False,
+    use_cache: bool = True,
+) -> Tuple[Path, bool, str]:
+    """Convert a single STEP file; safe to run in a spawned worker process.
+
+    Returns (src, success, message). Each successful conversion records the
+    STEP's SHA-1 and the mesh settings in an `<name>.stl.meta` sidecar; with
+    `use_cache`, a file whose sidecar still matches is skipped. Without a
+    sidecar, `skip_if_newer` skips an STL already newer than its STEP.
+    Skipped files are reported as successes.
+    """
+    out_path = out_dir / (src.stem + ".stl")
+    meta_path = out_path.with_suffix(".stl.meta")
+    meta = _read_meta(meta_path) if use_cache and out_path.exists() else None
+    if meta is None and skip_if_newer and _is_up_to_date(src, out_path):
+        return src, True, f"SKIP: {src.name} (up to date: {out_path})"
+    try:
+        # Sniff before hashing so junk files cost one 4 KB read, not a full SHA-1
+        if not _looks_like_step(src):
+            return src, False, f"ERROR: not a STEP file: {src}"
+        # JSON round-trip so the key compares equal to what a sidecar holds
+        key = json.loads(json.dumps({
+            "sha1": _sha1_file(src),
+            "linear": linear,
+            "angular": angular,
+            "relative": relative,
+            "rotation": rot_params,
+            "binary": binary,
+            "rotate_mesh": rotate_mesh,
+        }))
+        if meta == key:
+            return src, True, f"SKIP: {src.name} (unchanged since last conversion: {out_path})"
+    except Exception as e:  # noqa: BLE001
+        return src, False, f"ERROR: {src} -> {e}"
+    # Imported once per worker process; later files reuse the cached modules.
+    # Not caught: a worker without FreeCAD must fail the pool so `_run_jobs`
+    # falls back to converting in the parent instead of erroring every file.
+    fc = _load_freecad()
+    try:
+        doc = _scratch_document(fc)
+        rot = _rotation_from_params(rot_params)
+    except Exception as e:  # noqa: BLE001
+        return src, False, f"ERROR: {src} -> {e}"
+    success, msg = convert_file(
+        fc,
+        doc,
+        src,
+        out_dir,
+        linear_deflection=linear,
+        angular_deflection=angular,
+        relative=relative,
+        binary=binary,
+        rot=rot,
+        rotate_mesh=rotate_mesh,
+    )
+    if success:
         try:
-            shape = Part.Shape()
-            shape.read(str(src))
-            if hasattr(shape, "isNull") and shape.isNull():
-                raise RuntimeError("empty shape from STEP")
-            mesh = MeshPart.meshFromShape(
-                Shape=shape,
-                LinearDeflection=float(linear_deflection),
-                AngularDeflection=float(angular_deflection),
-                Relative=bool(relative),
-            )
-            if binary:
-                mesh.write(str(out_path), "STL")
-            else:
-                Mesh.write(mesh, str(out_path))
-            return True, f"OK: {src.name} -> {out_path}"
-        except Exception:
-            # Second attempt: document-based import (handles some multi-body edge cases)
-            try:
-                import Import  # type: ignore
-            except Exception as ie:
-                raise ie
+            meta_path.write_text(json.dumps(key, indent=2))
+        except OSError as e:
+            msg += f" (WARN: could not write {meta_path.name}: {e})"
+    return src, success, msg
+
+
+def _spawn_executable() -> Optional[str]:
+    """Return a Python interpreter usable for spawned workers, or None.
+
+    Inside FreeCADCmd `sys.executable` may point at FreeCADCmd itself; in that
+    case look for the Python interpreter bundled next to it.
+    """
+    exe = Path(sys.executable) if sys.executable else None
+    if exe is None:
+        return None
+    if "python" in exe.name.lower():
+        return str(exe)
+    for name in ("python.exe", "python3", "python"):
+        cand = exe.with_name(name)
+        if cand.is_file():
+            return str(cand)
+    return None
+
+
+def _worker_ready() -> None:
+    """Pool probe: raises in the worker if it cannot load FreeCAD."""
+    _load_freecad()
+
+
+def _run_jobs(jobs: Iterable[tuple], workers: int, threads: int = 1) -> Iterator[Tuple[Path, bool, str]]:
+    """Yield `_convert_one` results, in completion order when running in parallel.
+
+    With `threads` > 1, files are converted by a thread pool inside this
+    process; this only scales if MeshPart releases the GIL while tessellating.
+    Otherwise uses a spawn-based process pool (FreeCAD state is not fork-safe)
+    and falls back to converting serially in this process if the pool cannot
+    start, its workers cannot import FreeCAD, or the pool breaks (a worker
+    dies or a job cannot be pickled). Any other exception from a job is
+    reported as that file's ERROR result.
+    """
+    if threads > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=threads) as ex:
+            yield from ex.map(lambda job: _convert_one(*job), jobs)
+        return
 
-            doc = FreeCAD.newDocument()
+    jobs = iter(jobs)
+    exe = _spawn_executable() if workers > 1 else None
+    ex = None
+    if exe is not None:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        from concurrent.futures.process import BrokenProcessPool
+
+        ctx = multiprocessing.get_context("spawn")
+        ctx.set_executable(exe)
+        try:
+            ex = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+            # Check a worker can load FreeCAD before handing it the batch
+            ex.submit(_worker_ready).result()
+        except Exception as e:  # noqa: BLE001
+            print(f"WARN: process pool unavailable ({e}); converting serially")
+            if ex is not None:
+                ex.shutdown(wait=False)
+            ex = None
+
+    if ex is not None:
+        # Only these mean the pool itself is unusable; anything else is one file's error
+        pool_errors = (BrokenProcessPool, pickle.PicklingError)
+        pending = {}
+        unsent = None
+        broken = None
+        with ex:
             try:
-                Import.insert(str(src), doc.Name)
-                combined = Mesh.Mesh()
-                part_count = 0
-                for obj in list(doc.Objects):
-                    sh = getattr(obj, "Shape", None)
-                    if sh is None:
-                        continue
+                # Workers start on the first submit while the walk continues
+                for unsent in jobs:
+                    pending[ex.submit(_convert_one, *unsent)] = unsent
+                unsent = None
+                for fut in as_completed(list(pending)):
+                    src = pending[fut][0]
                     try:
-                        if hasattr(sh, "isNull") and sh.isNull():
-                            continue
-                    except Exception:
-                        pass
-                    m = MeshPart.meshFromShape(
-                        Shape=sh,
-                        LinearDeflection=float(linear_deflection),
-                        AngularDeflection=float(angular_deflection),
-                        Relative=bool(relative),
-                    )
-                    combined.addMesh(m)
-                    part_count += 1
-
-                if part_count == 0:
-                    return False, f"ERROR: No meshable shapes found in {src}"
-
-                if binary:
-                    combined.write(str(out_path), "STL")
+                        result = fut.result()
+                    except pool_errors:
+                        raise
+                    except Exception as e:  # noqa: BLE001
+                        result = (src, False, f"ERROR: {src} -> {e}")
+                    del pending[fut]
+                    yield result
+            except pool_errors as e:
+                broken = e
+        if broken is not None:
+            # The pool has shut down; keep results that finished meanwhile, redo the rest
+            print(f"WARN: process pool failed ({broken}); converting remaining files serially")
+            retry = [unsent] if unsent is not None else []
+            for fut, job in pending.items():
+                if fut.done() and not fut.cancelled() and fut.exception() is None:
+                    yield fut.result()
                 else:
-                    Mesh.write(combined, str(out_path))
-                return True, f"OK: {src.name} -> {out_path} ({part_count} parts)"
-            finally:
-                try:
-                    FreeCAD.closeDocument(doc.Name)
-                except Exception:
-                    pass
-    except Exception as e:  # noqa: BLE001
-        return False, f"ERROR: {src} -> {e}"
+                    retry.append(job)
+            jobs = itertools.chain(retry, jobs)
+    for job in jobs:
+        yield _convert_one(*job)
+
+
+def _move_to_processed(src: Path, processed_dir: Path) -> None:
+    dst = processed_dir / src.name
+    # Avoid overwriting; add suffix if needed
+    if dst.exists():
+        stem, suf = src.stem, src.suffix
+        ts = time.strftime("%Y%m%d-%H%M%S")
+        dst = processed_dir / f"{stem}-{ts}{suf}"
+    try:
+        # Same filesystem (both under STEP-INPUT/): a single atomic rename
+        os.replace(src, dst)
+    except Exception as me:
+        print(f"WARN: could not move {src} -> {dst}: {me}")
 
 
 def main(argv: Iterable[str]) -> int:
     ns = parse_args(argv)
     try:
         # Check FreeCAD availability early for nicer error messages
-        import FreeCAD  # noqa: F401  # type: ignore
+        _load_freecad()
     except Exception:
         sys.stderr.write(
             "FreeCAD Python modules not found. Run with `freecadcmd` or install FreeCAD Python packages.\n"
@@ -301,7 +856,12 @@ def main(argv: Iterable[str]) -> int:
             rotate_x=float(cfg.get("rotate_x", getattr(ns, "rotate_x", 0.0) or 0.0)),
             rotate_y=float(cfg.get("rotate_y", getattr(ns, "rotate_y", 0.0) or 0.0)),
             rotate_z=float(cfg.get("rotate_z", getattr(ns, "rotate_z", 0.0) or 0.0)),
-            binary=cfg.get("binary", getattr(ns, "binary", False)),
+            rotate_mesh=bool(cfg.get("rotate_mesh", getattr(ns, "rotate_mesh", False))),
+            binary=bool(cfg.get("binary", getattr(ns, "binary", True))),
+            workers=int(cfg.get("workers", getattr(ns, "workers", 0) or 0)),
+            jobs=int(cfg.get("jobs", getattr(ns, "jobs", 1) or 1)),
+            force=getattr(ns, "force", False),
+            defer_move=bool(cfg.get("defer_move", getattr(ns, "defer_move", False))),
         )
 
     # Resolve absolute paths to avoid CWD issues with FreeCADCmd
@@ -311,21 +871,12 @@ def main(argv: Iterable[str]) -> int:
 
     linear, angular, relative = resolve_mesh_params(ns)
 
-    targets = list(find_step_files(ns.input))
-    if not targets:
-        if drop_mode:
-            print(
-                "No .step/.stp files found in STEP-INPUT/. Drop files there and re-run."
-            )
-            return 0
-        sys.stderr.write("No .step/.stp files found.\n")
-        return 1
-
     base_out = ns.out if ns.out is not None else (script_dir / "STL-OUTPUT")
+    input_is_dir = ns.input.is_dir()
 
     def out_for(p: Path) -> Path:
         # Mirror substructure when input is a directory
-        if ns.input.is_dir():
+        if input_is_dir:
             try:
                 rel = p.parent.relative_to(ns.input)
             except ValueError:
@@ -333,87 +884,73 @@ def main(argv: Iterable[str]) -> int:
             return base_out / rel
         return base_out
 
-    print(f"Found {len(targets)} file(s). Output: {base_out}")
+    # Count in a cheap first pass for the log line (collecting the output
+    # directories to create up front), then stream the second
+    total = 0
+    out_dirs = set()
+    for src in find_step_files(ns.input):
+        total += 1
+        out_dirs.add(out_for(src))
+    if not total:
+        if drop_mode:
+            print(
+                "No .step/.stp files found in STEP-INPUT/. Drop files there and re-run."
+            )
+            return 0
+        sys.stderr.write("No .step/.stp files found.\n")
+        return 1
 
-    # Build final rotation to apply
+    for d in out_dirs:
+        d.mkdir(parents=True, exist_ok=True)
+    print(f"Found {total} file(s). Output: {base_out}")
+
+    # Build final rotation to apply; workers get it as plain axis/angle values,
+    # or None when it is the identity so no Placement is touched at all
     rot = compose_rotation(ns)
-    try:
-        import FreeCAD as App  # type: ignore
-    except Exception:
-        App = None  # type: ignore
+    rot_identity = (rot is None) or (abs(rot.Angle) < 1e-12)
+    rot_params = None if rot_identity else _rotation_params(rot)
+    binary = bool(getattr(ns, "binary", True))
+    rotate_mesh = bool(getattr(ns, "rotate_mesh", False))
+    # Unless forced, skip files already converted with the same content and
+    # settings; outside drop-folder mode, also leave STLs newer than their STEP alone
+    use_cache = not bool(getattr(ns, "force", False))
+    skip_if_newer = use_cache and not drop_mode
+
+    jobs = (
+        (src, out_for(src), linear, angular, relative, rot_params, binary, rotate_mesh, skip_if_newer, use_cache)
+        for src in find_step_files(ns.input, warn=False)  # counting pass already warned
+    )
+    workers = getattr(ns, "workers", 0) or (os.cpu_count() or 1)
+    workers = max(1, min(workers, total))
+    threads = max(1, min(int(getattr(ns, "jobs", 1) or 1), total))
+
+    processed_dir = ns.input / "_processed"  # created at startup in drop-folder mode
+    defer_move = bool(getattr(ns, "defer_move", False))
+    to_move = []
     ok = 0
-    for src in targets:
-        # Read shape, apply rotation eagerly, then mesh (direct path)
-        success = False
-        msg = ""
-        try:
-            import Part  # type: ignore
-            import MeshPart  # type: ignore
-            import Mesh  # type: ignore
-
-            out_dir = out_for(src)
-            out_dir.mkdir(parents=True, exist_ok=True)
-            out_path = out_dir / (src.stem + ".stl")
-
-            shape = Part.Shape()
-            shape.read(str(src))
-            if hasattr(shape, "isNull") and shape.isNull():
-                raise RuntimeError("empty shape from STEP")
-            if App is not None and isinstance(rot, App.Rotation.__class__) or hasattr(rot, "Axis"):
-                # Apply rotation via Placement
-                shp = shape.copy()
-                shp.Placement = App.Placement(App.Vector(0, 0, 0), rot)
-            else:
-                shp = shape
-            mesh = MeshPart.meshFromShape(
-                Shape=shp,
-                LinearDeflection=float(linear),
-                AngularDeflection=float(angular),
-                Relative=bool(relative),
-            )
-            if getattr(ns, "binary", False):
-                mesh.write(str(out_path), "STL")
-            else:
-                Mesh.write(mesh, str(out_path))
-            success = True
-            msg = f"OK: {src.name} -> {out_path}"
-        except Exception:
-            # Fallback to convert_file which handles doc-based import and gmsh
-            success, msg = convert_file(
-                src,
-                out_for(src),
-                linear_deflection=linear,
-                angular_deflection=angular,
-                relative=relative,
-                binary=getattr(ns, "binary", False),
-            )
+    for src, success, msg in _run_jobs(jobs, workers, threads):
         print(msg)
         if success:
             ok += 1
             # In drop-folder mode, move processed STEP into _processed/
             if drop_mode:
-                processed_dir = ns.input / "_processed"
-                processed_dir.mkdir(parents=True, exist_ok=True)
-                dst = processed_dir / src.name
-                # Avoid overwriting; add suffix if needed
-                if dst.exists():
-                    stem, suf = src.stem, src.suffix
-                    ts = time.strftime("%Y%m%d-%H%M%S")
-                    dst = processed_dir / f"{stem}-{ts}{suf}"
-                try:
-                    shutil.move(str(src), str(dst))
-                except Exception as me:
-                    print(f"WARN: could not move {src} -> {dst}: {me}")
-
-    print(f"Done. {ok}/{len(targets)} converted.")
-    return 0 if ok == len(targets) else 3
+                if defer_move:
+                    to_move.append(src)
+                else:
+                    _move_to_processed(src, processed_dir)
+    for src in to_move:
+        _move_to_processed(src, processed_dir)
+
+    _close_scratch_documents(_load_freecad())
+    print(f"Done. {ok}/{total} converted.")
+    return 0 if ok == total else 3
 
 
 if __name__ == "__main__":
     raise SystemExit(main(sys.argv[1:]))
-else:
+elif __name__ != "__mp_main__":
     # FreeCAD macro/CLI mode sometimes imports the file instead of executing __main__
-    # Try to run main() once in that case.
+    # Try to run main() once in that case (but never inside a spawned worker).
     try:
         import FreeCAD  # type: ignore  # noqa: F401
         if not getattr(sys, "_step2stl_invoked", False):